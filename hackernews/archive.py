@@ -0,0 +1,287 @@
+# 标准模块
+import hashlib # 内容哈希, 用作文章的存储键
+import re
+import sqlite3 # 索引库, 记录 URL -> 哈希 -> 分段文件位置
+import threading
+import zlib # zlib(deflate)压缩, 在没有zstd时作为兜底
+from pathlib import Path, PurePosixPath
+
+# 第三方模块
+from loguru import logger # 日志库
+
+try:
+    import zstandard # 可选依赖, 安装后优先使用zstd压缩
+except ImportError:
+    zstandard = None
+
+segment_max_size = 64 * 1024 * 1024 # 单个分段文件的上限为64MB, 超过后滚动到新分段
+compress_level = 6
+
+_unsafe_chars = re.compile(r'[\\/:*?"<>|\x00-\x1f]+') # Windows和POSIX都不允许的文件名字符
+
+_schema = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest   TEXT PRIMARY KEY, -- 原始内容的sha256
+    segment  INTEGER NOT NULL, -- 分段文件编号
+    offset   INTEGER NOT NULL, -- 压缩数据在分段中的起始位置
+    length   INTEGER NOT NULL, -- 压缩后长度
+    size     INTEGER NOT NULL, -- 原始长度
+    codec    TEXT NOT NULL     -- zstd / zlib
+);
+CREATE TABLE IF NOT EXISTS articles (
+    url      TEXT NOT NULL,
+    fmt      TEXT NOT NULL,    -- markdown / html / pdf
+    digest   TEXT NOT NULL REFERENCES blobs(digest),
+    PRIMARY KEY (url, fmt)
+);
+CREATE TABLE IF NOT EXISTS paths (
+    path     TEXT PRIMARY KEY, -- 给人看的路径, 如 Cyber-Attacks/Some-Title.pdf
+    url      TEXT NOT NULL,
+    fmt      TEXT NOT NULL
+);
+"""
+
+def safe_filename(name: str, max_length: int = 150) -> str:
+    """把标题转换为合法的文件名
+    Args:
+        name (str): 原始标题或分区名
+        max_length (int, optional): 文件名最大长度, 默认150
+    Returns:
+        str: 空格替换为-, 去掉路径分隔符和?等非法字符后的文件名
+    """
+    name = _unsafe_chars.sub('', name).strip().replace(' ', '-')
+    name = name.strip('.') # 避免出现 . / .. 或者隐藏文件
+    return name[:max_length] or 'untitled'
+
+
+class ArticleArchive:
+    """按内容哈希存储文章的压缩归档
+
+    文章内容按sha256去重后压缩, 追加写入滚动的分段文件(segment-xxxxx.pack),
+    sqlite索引记录每篇文章所在的分段和偏移, 按URL随机读取只需一次seek.
+    同一篇文章出现在多个分区时只保存一份内容, 分区只体现在paths视图里.
+    """
+    def __init__(self,
+                 root: Path, # 归档根目录
+                 segment_size: int = segment_max_size, # 分段文件滚动阈值
+                 codec: str = None # 压缩算法, 默认有zstd用zstd, 否则用zlib
+                 ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        if codec is None:
+            codec = 'zstd' if zstandard is not None else 'zlib'
+        if codec == 'zstd' and zstandard is None:
+            raise ValueError("未安装zstandard, 无法使用zstd压缩")
+        if codec not in ('zstd', 'zlib'):
+            raise ValueError(f"不支持的压缩算法: {codec}")
+        self.codec = codec
+
+        self._lock = threading.Lock() # 保护分段文件的追加写入
+        self._db = sqlite3.connect(self.root / 'index.sqlite3', check_same_thread=False)
+        self._db.executescript(_schema)
+        self._readers = {} # 分段编号 -> 只读文件句柄
+        row = self._db.execute("SELECT MAX(segment) FROM blobs").fetchone()
+        self._segment = row[0] or 1 # 当前写入的分段编号
+        self._writer = None
+        logger.debug(f"已打开文章归档: {self.root}, 压缩算法为{self.codec}")
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:05d}.pack"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=compress_level).compress(data)
+        return zlib.compress(data, compress_level)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("该文章使用zstd压缩, 但当前环境未安装zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def _append(self, payload: bytes) -> tuple[int, int]:
+        """把压缩数据追加到当前分段, 超过阈值时滚动到新分段
+        Returns:
+            tuple[int, int]: (分段编号, 偏移)
+        """
+        if self._writer is None:
+            self._writer = open(self._segment_path(self._segment), 'ab')
+        offset = self._writer.tell()
+        if offset > 0 and offset + len(payload) > self.segment_size:
+            self._writer.close()
+            self._segment += 1
+            logger.info(f"分段文件已满, 滚动到第{self._segment}个分段")
+            self._writer = open(self._segment_path(self._segment), 'ab')
+            offset = 0
+        self._writer.write(payload)
+        self._writer.flush() # 先落盘数据再写索引, 索引里不会出现指向空洞的记录
+        return self._segment, offset
+
+    def put(self, url: str, content: bytes | str, fmt: str, path: str = None) -> str:
+        """保存一篇文章
+        Args:
+            url (str): 文章链接, 随机读取时的键
+            content (bytes | str): 文章内容, str按utf-8编码
+            fmt (str): 导出格式, 如markdown、html、pdf
+            path (str, optional): 人类可读的视图路径, 如"分区/标题.pdf"
+        Returns:
+            str: 内容的sha256
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock, self._db:
+            exists = self._db.execute(
+                "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+            if exists is None:
+                payload = self._compress(content)
+                segment, offset = self._append(payload)
+                self._db.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, segment, offset, len(payload), len(content), self.codec)
+                )
+                logger.debug(f"{url}内容已压缩写入, {len(content)} -> {len(payload)}字节")
+            else:
+                logger.debug(f"{url}的内容已存在于归档中, 跳过写入")
+            self._db.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?)", (url, fmt, digest)
+            )
+            if path is not None:
+                self._bind_path(path, url, fmt)
+        return digest
+
+    def _bind_path(self, path: str, url: str, fmt: str) -> str:
+        """把视图路径指向文章, 调用方需持有锁并处在事务中
+
+        safe_filename会去掉/?:等字符并截断标题, 同一分区下不同的标题可能得到相同的路径
+        (如"A/B"和"AB"), 此时不覆盖已有的文章, 而是在文件名后加上URL哈希的前8位.
+        Returns:
+            str: 实际使用的路径
+        """
+        base = PurePosixPath(path)
+        tag = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        for length in (0, 8, 64):
+            candidate = str(base.with_name(f"{base.stem}-{tag[:length]}{base.suffix}")) if length else path
+            row = self._db.execute(
+                "SELECT url, fmt FROM paths WHERE path = ?", (candidate,)
+            ).fetchone()
+            if row is not None and row != (url, fmt):
+                continue # 路径已被另一篇文章占用
+            if row is None:
+                self._db.execute("INSERT INTO paths VALUES (?, ?, ?)", (candidate, url, fmt))
+            if length:
+                logger.warning(f"路径{path}已被其他文章占用, {url}改用{candidate}")
+            return candidate
+        raise ValueError(f"无法为{url}分配视图路径{path}")
+
+    def has(self, url: str, fmt: str) -> bool:
+        """判断文章是否已经归档, 用于跳过重复的页面导航和渲染"""
+        row = self._db.execute(
+            "SELECT 1 FROM articles WHERE url = ? AND fmt = ?", (url, fmt)
+        ).fetchone()
+        return row is not None
+
+    def add_path(self, path: str, url: str, fmt: str) -> str:
+        """为已归档的文章增加一个视图路径(例如同一篇文章出现在另一个分区)
+        Returns:
+            str: 实际使用的路径, 与其他文章冲突时带有URL哈希后缀
+        """
+        with self._lock, self._db:
+            return self._bind_path(path, url, fmt)
+
+    def get(self, url: str, fmt: str = None) -> bytes:
+        """按URL读取文章内容
+        Args:
+            url (str): 文章链接
+            fmt (str, optional): 导出格式, 不指定时返回任意一种已保存的格式
+        Raises:
+            KeyError: 归档中不存在该文章
+        """
+        query = """
+            SELECT b.segment, b.offset, b.length, b.codec
+            FROM articles a JOIN blobs b ON a.digest = b.digest
+            WHERE a.url = ?
+        """
+        params = (url,)
+        if fmt is not None:
+            query += " AND a.fmt = ?"
+            params = (url, fmt)
+        row = self._db.execute(query, params).fetchone()
+        if row is None:
+            raise KeyError(url)
+        segment, offset, length, codec = row
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+            reader = self._readers.get(segment)
+            if reader is None:
+                reader = self._readers[segment] = open(self._segment_path(segment), 'rb')
+            reader.seek(offset)
+            payload = reader.read(length)
+        return self._decompress(payload, codec)
+
+    def read_path(self, path: str) -> bytes:
+        """按视图路径读取文章内容"""
+        row = self._db.execute(
+            "SELECT url, fmt FROM paths WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return self.get(*row)
+
+    def paths(self, prefix: str = '') -> list[str]:
+        """列出视图路径, 类似于ls, prefix可以是分区名"""
+        rows = self._db.execute(
+            "SELECT path FROM paths WHERE substr(path, 1, ?) = ? ORDER BY path",
+            (len(prefix), prefix)
+        )
+        return [row[0] for row in rows]
+
+    def export(self, output_dir: Path, prefix: str = '') -> int:
+        """把视图路径还原为普通文件, 方便直接浏览
+        Returns:
+            int: 导出的文件个数
+        """
+        output_dir = Path(output_dir)
+        count = 0
+        for path in self.paths(prefix):
+            target = output_dir / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read_path(path))
+            count += 1
+        logger.info(f"已从归档导出{count}个文件到{output_dir}")
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """归档的统计信息: 文章数、去重后的内容数、原始大小和压缩后大小"""
+        articles = self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        blobs, segments, size, stored = self._db.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT segment), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM blobs"
+        ).fetchone()
+        return {
+            'articles': articles,
+            'blobs': blobs,
+            'segments': segments, # 实际写入过数据的分段数, 空归档为0
+            'raw_bytes': size,
+            'stored_bytes': stored,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,78 @@
+"""对比文章列表表格的内存占用
+
+分三种情况统计构建完成后仍然存活的内存:
+  list[str]      原来的写法, 每行是页面返回的新字符串组成的list, 装进tablib表格
+  ArticleRow     数据行append进tablib表格, tablib仍会为每行复制一个list, 只省下intern和类型转换带来的部分
+  ArticleTable   爬虫现在保存的按列表格, 每行不再有单独的list和行对象
+运行: python -m hackernews.benchmarks.bench_rows [行数]
+"""
+# 标准模块
+import sys
+import tracemalloc
+from random import Random
+
+# 第三方模块
+import tablib # Tablib用于数据表格处理
+
+from hackernews.engine import article_headers
+from hackernews.rows import ArticleRow, ArticleTable, parse_date
+
+categories = ['Cyber Attacks', 'Vulnerabilities', 'Malware', 'Data Breach', 'Expert Insights']
+tags = ['Cyber Attack / Malware', 'Vulnerability', 'Threat Intelligence', 'Ransomware', '空 / 文章未设置标签']
+months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def fake_posts(count: int, seed: int = 0):
+    # 模拟evaluate返回的数据: 每一行的字符串都是新创建的对象, 即使内容重复
+    rng = Random(seed)
+    for i in range(count):
+        yield (
+            ''.join(rng.choice(categories)), # join产生新的字符串对象, 和反序列化的结果一样
+            {
+                'link': f"https://thehackernews.com/2026/{i % 12 + 1:02d}/article-{i}.html",
+                'title': f"Threat Actors Exploit Flaw #{i} in Popular Enterprise Software",
+                'date': f"{rng.choice(months)} {rng.randint(1, 28):02d}, 2026",
+                'tags': ''.join(rng.choice(tags)),
+                'desc': f"Cybersecurity researchers have disclosed details {i}"[:50],
+            },
+            rng.randint(1, 10),
+        )
+
+def measure(build) -> int:
+    # 只统计构建完成后仍然存活的内存, 中间的ArticleRow等临时对象已经释放
+    tracemalloc.start()
+    dataset = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del dataset
+    return size
+
+def as_lists(count: int) -> tablib.Dataset:
+    # 原来的写法: 页码是int, 日期保留文本
+    dataset = tablib.Dataset(headers=article_headers)
+    for category, post, page in fake_posts(count):
+        dataset.append([category, post['link'], post['title'], post['date'], post['tags'], post['desc'], page])
+    return dataset
+
+def as_rows(count: int) -> tablib.Dataset:
+    dataset = tablib.Dataset(headers=article_headers)
+    for category, post, page in fake_posts(count):
+        dataset.append(ArticleRow.from_post(category, post, page, '%b %d, %Y'))
+    return dataset
+
+def as_table(count: int) -> ArticleTable:
+    table = ArticleTable(article_headers)
+    for category, post, page in fake_posts(count):
+        table.append(ArticleRow.from_post(category, post, page, '%b %d, %Y'))
+    return table
+
+def main(count: int = 100_000):
+    parse_date('Oct 18, 2026', '%b %d, %Y') # 预热strptime的正则缓存, 不计入结果
+    list_size = measure(lambda: as_lists(count))
+    print(f"{count}行, 构建完成后保留的内存")
+    print(f"list[str]    : {list_size / count:8.1f} 字节/行")
+    for name, build in (('ArticleRow', as_rows), ('ArticleTable', as_table)):
+        size = measure(lambda: build(count))
+        print(f"{name:<13}: {size / count:8.1f} 字节/行  节省{1 - size / list_size:6.1%}")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
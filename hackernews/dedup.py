@@ -0,0 +1,120 @@
+# 标准模块
+import hashlib
+import random
+import re
+from collections import defaultdict
+
+# 第三方模块
+from loguru import logger # 日志库
+
+num_perm = 64 # MinHash签名长度(哈希函数个数)
+num_bands = 16 # LSH分段数, 每段 num_perm // num_bands 行
+similarity_threshold = 0.6 # 估计的Jaccard相似度不低于0.6即视为近似重复
+
+_prime = (1 << 61) - 1 # 梅森素数, 用于 (a * x + b) mod p 形式的哈希族
+_token_pattern = re.compile(r'\w+', re.UNICODE)
+
+def shingles(text: str) -> set[str]:
+    """把文本切分为特征集合: 小写单词和相邻单词组成的二元组"""
+    words = _token_pattern.findall(text.lower())
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+def _hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class MinHasher:
+    """MinHash签名生成器, 同一个种子生成的签名才能互相比较"""
+    def __init__(self, num_perm: int = num_perm, seed: int = 1):
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _prime), rng.randrange(0, _prime)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        """计算文本的MinHash签名
+        Args:
+            text (str): 标题+描述或正文
+        Returns:
+            tuple[int, ...]: 签名, 两个签名相同位置相等的比例即Jaccard相似度的估计
+        """
+        hashes = [_hash(feature) for feature in shingles(text)] or [0]
+        return tuple(
+            min((a * h + b) % _prime for h in hashes) for a, b in self._perms
+        )
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """由两个MinHash签名估计Jaccard相似度"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """基于MinHash + LSH分段的近似重复检测
+
+    签名被切成num_bands段, 任意一段完全相同的条目才会成为候选再精确比较,
+    查询只需要看同段桶里的少量候选, 不用和所有已收录的条目两两比较.
+    标题+描述这样的短文本用MinHash比SimHash稳定, 改一个词不会让签名大幅波动.
+    """
+    def __init__(self,
+                 threshold: float = similarity_threshold, # 相似度阈值
+                 num_perm: int = num_perm,
+                 num_bands: int = num_bands
+                 ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold必须在(0, 1]之间")
+        if num_perm % num_bands != 0:
+            raise ValueError("num_perm必须是num_bands的整数倍")
+        self.threshold = threshold
+        self._hasher = MinHasher(num_perm)
+        self._bands = num_bands
+        self._rows = num_perm // num_bands
+        self._buckets = defaultdict(list) # (段号, 段内签名) -> [key]
+        self._signatures = {} # key -> 签名
+
+    def _band_keys(self, signature: tuple[int, ...]):
+        for band in range(self._bands):
+            yield band, signature[band * self._rows:(band + 1) * self._rows]
+
+    def find(self, text: str) -> str | None:
+        """查找与text近似重复的已收录条目
+        Returns:
+            str | None: 最相似的条目key, 没有则返回None
+        """
+        return self._find(self._hasher.signature(text))
+
+    def _find(self, signature: tuple[int, ...]) -> str | None:
+        best, best_score = None, self.threshold
+        seen = set()
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self._signatures[key])
+                if score >= best_score:
+                    best, best_score = key, score
+        return best
+
+    def add(self, key: str, text: str) -> str | None:
+        """收录一个条目, 如果已有近似重复的条目则不收录
+        Args:
+            key (str): 条目的键, 一般是文章链接
+            text (str): 用于计算签名的文本
+        Returns:
+            str | None: 已存在的近似重复条目的key, 新条目返回None
+        """
+        signature = self._hasher.signature(text)
+        duplicate = self._find(signature)
+        if duplicate is not None:
+            logger.debug(f"{key}与{duplicate}近似重复")
+            return duplicate
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(key)
+        return None
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key: str):
+        return key in self._signatures
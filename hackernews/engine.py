@@ -0,0 +1,583 @@
+# 标准模块
+import asyncio
+import itertools
+import threading
+from pathlib import Path # Python3路径解析库
+from collections import defaultdict # 默认字典
+from contextlib import aclosing, nullcontext
+from typing import AsyncIterator, Callable, Iterable, Iterator, Literal
+import urllib.parse # URL解析库
+from queue import Queue # 线程安全, 用于缓存数据行
+
+# 第三方模块
+import playwright
+from playwright.sync_api import Page, Playwright, expect, sync_playwright # Playwright同步API
+import tablib # Tablib用于数据表格处理
+from alive_progress import alive_bar # 进度条库
+from markdownify import markdownify as md # markdownify库用于将HTML转换为Markdown格式
+from loguru import logger # 日志库
+
+# 本地模块
+from .archive import ArticleArchive, safe_filename # 按内容哈希压缩存储文章
+from .dedup import NearDuplicateIndex # MinHash近似重复检测
+from .profiler import OperationProfiler # 慢操作分析和采样trace
+from .rows import ArticleRow, ArticleTable # 文章列表的数据行和按列存储的表格
+from .spec import SiteSpec, compile_extractor, load_spec, menu_extractor # YAML站点描述
+
+timeout = 3000
+expect.set_options(timeout=timeout) # 设置Playwright的超时时间为3000毫秒
+
+output_path = Path(__file__).parent / 'output' # 输出路径
+output_path.mkdir(parents=True, exist_ok=True) # 创建输出目录
+
+log_path = Path(__file__).parent / 'logs' # 日志路径
+log_path.mkdir(parents=True, exist_ok=True) # 创建日志目录
+# 添加文件控制器
+logger.add(log_path / 'crawler.log', rotation='1 MB', retention='7 days', level='INFO') # 设置日志文件
+
+# 后面必要的常量
+article_headers = [
+    "分区", "链接", "标题", "日期", "标签", "描述", "页码"
+]
+table = ArticleTable(article_headers) # 按列存储的文章列表, 导出时才转换为tablib表格
+stream_buffer_size = 64 # 流式接口的缓冲行数, 调用方来不及处理时爬虫线程会在这里等待
+
+class SiteCrawler:
+    """通用的新闻站点爬虫
+
+    所有选择器都来自站点描述(SiteSpec), 文章列表的字段在页面内一次evaluate取回;
+    归档、近似重复检测和慢操作分析对所有站点都可用.
+    """
+    def __init__(self,
+                 spec: SiteSpec | str | Path, # 站点描述, 或内置站点名/YAML文件路径
+                 enable_random_sleep: bool = False,  # 是否启用随机睡眠
+                 page: Page = None,  # Playwright页面对象
+                 table: ArticleTable | tablib.Dataset = table, # 文章列表存储, 也可以传入tablib表格
+                 dedup: NearDuplicateIndex = None, # 标题+描述的近似重复索引, 传入后保存时跳过近似重复的文章
+                 profiler: OperationProfiler = None # 慢操作分析器, 默认不启用
+                 ):
+        self.spec = spec if isinstance(spec, SiteSpec) else load_spec(spec)
+        self.target = self.spec.target
+        self._date_format = dict(self.spec.fields)['date'].format
+        self.enable_random_sleep = enable_random_sleep
+        self.page = page
+        self._profiler = profiler
+        with self._measure('goto', self.target, page_url=self.target):
+            self.page.goto(self.target) # 访问目标网站
+        logger.info(f"已访问目标网站: {self.target}")
+        
+        # 初始化各种选择器和临时变量
+        self._category_locator = None # 板块横栏的无序列表选择器
+        self._category_links = defaultdict(str) # 板块横栏的链接dict
+        self._page_index = 1 # 当前页码索引
+        self._is_last_page = False # 是否是最后一页
+        self._posts_list = table # 文章列表
+        self._queue = Queue() # 用于缓存数据行的队列
+        self._dedup = dedup
+        self.near_duplicates = {} # (分区, 链接) -> 与之近似重复且已保存的文章链接
+
+    def _measure(self, op: str, selector: str = '', page_url: str = None):
+        # 没有启用分析器时返回空的上下文管理器, 不产生额外开销
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.measure(op, selector, page_url or self.page.url)
+
+    def _trace(self, name: str):
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.trace(self.page.context, name)
+
+    def get_menu_unordered_list(self):
+        """
+        获取板块横栏的无序列表
+        :param page: Playwright页面对象
+        :return: 无序列表的Locator分区对象, 已调用all处理, 可以遍历处理
+        """
+        logger.debug("正在获取所有分区的无序列表的选择器...")
+        # self.page.pause()  # 暂停页面加载
+        locator = self.page.locator(self.spec.menu)
+        with self._measure('expect', self.spec.menu):
+            expect(locator).to_be_visible()  # 确保无序列表可见(能够解析出来)
+        with self._measure('all', f"{self.spec.menu} >> {self.spec.menu_link}"):
+            self._category_locator = locator.locator(self.spec.menu_link).all()  
+        # 获取无序列表下的所有a标签
+        logger.info(f"已获取到分区的无序列表选择器, 共有{len(self._category_locator)}个分区")
+        return self._category_locator  # 兼容链式调用
+
+    def get_category_links(self):
+        """
+        获取各个分区的链接
+        :return: dict[str, str] 分区名 -> 分区链接
+        """
+        # 获取无序列表内分区的个数 # 相信调用者已经执行了get_menu_unordered_list方法
+        category_count = len(self._category_locator)
+        logger.debug(f"正在获取{category_count}个分区的链接...")
+        # 一次evaluate取回所有分区的名称和链接, 不再对每个a标签分别请求
+        menu_links = self.page.locator(self.spec.menu).locator(self.spec.menu_link)
+        with self._measure('evaluate_all', f"{self.spec.menu} >> {self.spec.menu_link}"):
+            categories = menu_links.evaluate_all(menu_extractor)
+        
+        links = {
+            name: href
+            for name, href in categories
+            if href is not None and not href.endswith(self.spec.exclude_suffixes)
+            # 过滤掉单页面的分区, 这些分区没有文章列表, 不是爬取目标
+        }
+        for name in self.spec.exclude:
+            links.pop(name, None)  # 移除站点描述中声明不是文章列表的分区
+        self._category_links = links  # 保存链接到实例变量
+        logger.info(f"已获取到{len(tuple(links.keys()))}个分区的链接, \
+            剔除了不存在文章列表的分区")
+        return links
+
+    def _goto_new_page(self, direction: str):
+        """跳转到新页面
+        Args:
+            direction (str): 目标页面的新路径(手动进行路径拼接处理)
+        """
+        # 先拼接路径
+        if direction.startswith('http://') or direction.startswith('https://'):
+            new_url = direction
+        else:
+            new_url = urllib.parse.urljoin(self.target, direction)
+        logger.debug(f"正在跳转到新页面: {new_url}")
+        with self._measure('goto', new_url, page_url=new_url):
+            self.page.goto(new_url)  # 跳转到新页面
+        self._page_index = 1 # 重置页码
+        self._is_last_page = False
+        logger.info(f"已跳转到新页面: {new_url}")
+    
+    def _goto_next_page(self):
+        """
+        跳转到下一页
+        :param page: Playwright页面对象
+        :return: Page对象
+        """
+        
+        next_page_button = self.page.get_by_text(self.spec.next_text)
+        logger.debug("正在跳转到下一页...")
+        try:
+            with self._measure('click', f"text={self.spec.next_text}"):
+                expect(next_page_button).to_be_visible() # 全局设置为3秒超时时间
+                next_page_button.click()
+            self._page_index += 1
+            logger.info(f"已跳转到第{self._page_index}页")
+        except AssertionError:
+            logger.warning("已到达最后一页或下一页按钮不可见")
+            self._is_last_page = True  # 设置为最后一页
+        
+        return self.page
+
+    def _goto_prev_page(self):
+        """
+        跳转到上一页
+        :param page: Playwright页面对象
+        :return: None
+        """
+        
+        prev_page_button = self.page.get_by_text(self.spec.prev_text)
+        logger.debug("正在跳转到上一页...")
+        try:
+            expect(prev_page_button).to_be_visible()  # 全局设置为3秒超时时间
+            prev_page_button.click()
+            self._page_index -= 1
+            logger.info(f"已跳转到第{self._page_index}页")
+        except AssertionError:
+            logger.warning("上一页按钮不可见或已到达第一页")
+        return self.page
+
+    def get_article_list(self, category: str):
+        """
+        获取单个分区单页的文章列表
+        :param page: Playwright页面对象
+        :return: 文章列表
+        """
+        page = self._page_index
+        # 定位到列表视窗
+        '''
+        测试时发现很容易定位不到, 这就很难绷了
+        '''
+        logger.debug("正在定位到文章列表容器...")
+        with self._trace(f"{category}-{page}"):
+            return self._get_article_list(category, page)
+
+    def _get_article_list(self, category: str, page: int):
+        # get_article_list的实际实现, 拆出来是为了整页包在采样trace里
+        rows = self._extract_rows(category, page)
+        if not rows:
+            logger.warning("无法找到文章列表容器, 将返回空表格...")
+            return self._posts_list
+        for row in rows:
+            self._queue.put(row) # 数据行直接入队, 不再另外复制成list
+        logger.info(f"已获取到{category}分区第{page}页的文章列表, 共计{len(rows)}篇")
+
+    def _extract_rows(self, category: str, page: int) -> list[ArticleRow]:
+        # 提取当前页的所有文章, get_article_list和iter_articles共用
+        posts_list_locator = self.page.locator(self.spec.item)
+        posts = posts_list_locator
+        # 用.last作为标志确保文章列表全部加载完成
+        with self._measure('expect', f"{self.spec.item} >> nth=-1"):
+            expect(posts.last).to_be_visible(timeout=self.spec.listing_timeout)
+        # 编译好的提取函数在页面内一次取回所有文章的所有字段
+        with self._measure('evaluate_all', self.spec.item):
+            posts = posts_list_locator.evaluate_all(compile_extractor(self.spec))
+        logger.debug(f"已提取{category}分区第{page}页的文章列表, 共有{len(posts)}篇文章")
+        return [ArticleRow.from_post(category, post, page, self._date_format) for post in posts]
+
+    def iter_articles(self,
+                      categories: Iterable[str] | dict[str, str] = None,
+                      max_pages: int | None = 1,
+                      ) -> Iterator[ArticleRow]:
+        """逐行产出文章, 每提取完一页就立刻交给调用方, 不用等整个爬取结束
+        生成器本身就是背压: 调用方不取下一行时, 爬虫不会翻页或跳转
+        Args:
+            categories (Iterable[str] | dict[str, str], optional): 要爬取的分区名,
+                或 分区名 -> 链接 的dict; 默认爬取菜单中的所有分区
+            max_pages (int | None, optional): 每个分区最多翻几页, 默认1; None表示一直翻到最后一页
+        Yields:
+            ArticleRow: 文章列表的数据行
+        Raises:
+            ValueError: max_pages小于1, 或分区不在站点菜单中(调用时立即抛出, 不等到迭代)
+        """
+        _check_max_pages(max_pages)
+        if isinstance(categories, dict):
+            links = categories
+        else:
+            if not self._category_links:
+                self.get_menu_unordered_list()
+                self.get_category_links()
+            names = list(self._category_links) if categories is None else list(categories)
+            unknown = [name for name in names if name not in self._category_links]
+            if unknown:
+                raise ValueError(f"站点菜单中不存在这些分区: {', '.join(unknown)}")
+            links = {name: self._category_links[name] for name in names}
+        return self._iter_articles(links, max_pages)
+
+    def _iter_articles(self, links: dict[str, str], max_pages: int | None) -> Iterator[ArticleRow]:
+        # iter_articles的生成器部分, 拆出来是为了让参数检查在调用时就生效
+        for category, link in links.items():
+            for page_count in itertools.count() if max_pages is None else range(max_pages):
+                # trace从进入这一页的导航(跳转或点击下一页)开始, 到提取完成结束,
+                # 产出数据行之前就停止, 不把调用方处理数据行的时间算进去
+                with self._trace(f"{category}-{page_count + 1}"):
+                    if page_count == 0:
+                        self._goto_new_page(link)
+                    else:
+                        self._goto_next_page()
+                    rows = None if self._is_last_page else self._extract_rows(category, self._page_index)
+                if rows is None:
+                    break
+                yield from rows
+        
+    def _move_article_list(self): 
+        # 在执行完爬取链接任务后调用这个方法转移数据
+        # 默认的ArticleTable按列保存, 每行不再单独占用一个list; 传入tablib表格时仍按行复制
+        while not self._queue.empty():
+            self._posts_list.append(self._queue.get())
+        self._posts_list.remove_duplicates() # 去除重复行
+        return self._posts_list
+            
+    # 推荐用PDF格式, 
+    # MD格式导出时由于没有单独剔出文章部分，会导致导出格式变得很混乱
+    def save_article(self, 
+                     output_mode: Literal["markdown", "html", "pdf"] = 'pdf',
+                     archive: ArticleArchive = None,
+                     body_dedup: NearDuplicateIndex = None,
+                     ):
+        """保存文章到本地
+        Args:
+            output_mode (str, optional): 导出格式, 默认为markdown、html或pdf
+            archive (ArticleArchive, optional): 文章归档, 传入后文章压缩写入归档,
+                不再按 分区/标题 逐个写散文件; 已归档的URL不会再次打开和渲染
+            body_dedup (NearDuplicateIndex, optional): 正文的近似重复索引, 传入后
+                打开页面时提取正文比较, 近似重复的文章不再渲染和保存
+        """
+        extensions = {'markdown': 'md', 'html': 'html', 'pdf': 'pdf'}
+        duplicate = object() # 正文近似重复而跳过的标记, 与保存成功的True区分
+        pending_bodies = {} # 链接 -> 已打开但还未保存的文章正文
+        
+        def _post_path(post, fmt: str):
+            # 散文件和归档共用同一套 分区/标题.后缀 的路径
+            return f"{safe_filename(post[0])}/{safe_filename(post[2])}.{extensions[fmt]}"
+        
+        def _store_post(post, content: bytes | str, fmt: str):
+            url, path = post[1], _post_path(post, fmt)
+            if archive is not None:
+                archive.put(url, content, fmt, path=path)
+                return
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            with open(output_path / path, 'wb') as f:
+                f.write(content)
+        
+        def _safe_load_page(post: list):
+            category, url, title = post[0], post[1], post[2]
+            logger.debug(f"正在打开{url}页面...")
+            with self._measure('goto', url, page_url=url):
+                self.page.goto(url)
+            logger.info(f"{url}页面打开成功")
+            # logger.debug(f"等待{url}页面加载完成...")
+            # self.page.wait_for_load_state('networkidle')
+            logger.info(f"{url}页面加载完成")
+            if body_dedup is not None and self.spec.article_body:
+                body = self.page.locator(self.spec.article_body)
+                if body.count() > 0:
+                    body_text = body.first.inner_text()
+                    original = url if url in body_dedup else body_dedup.find(body_text)
+                    if original is not None and original != url:
+                        self.near_duplicates[(category, url)] = original
+                        if archive is not None and archive.has(original, output_mode):
+                            archive.add_path(_post_path(post, output_mode), original, output_mode)
+                        logger.info(f"{url}的正文与{original}近似重复, 跳过渲染")
+                        return None
+                    # 先记下正文, 保存成功后才收录到索引里
+                    pending_bodies[url] = body_text
+            return self.page
+
+        
+        def _save_md_post(post, page: Page):
+                category, url, title = post[0], post[1], post[2]
+                try:
+                    page = _safe_load_page(post)
+                except playwright._impl._errors.TimeoutError as e:
+                    logger.error(f"打开{url}页面时发生超时异常: {e}")
+                    return False
+                except Exception as e:
+                    logger.error(f"打开{url}页面时发生异常: {e}")
+                    return False
+                if page is None:
+                    return duplicate # 正文近似重复, 不需要保存
+                
+                with self._measure('content', url):
+                    page_html = page.content()
+                _store_post(post, md(page_html), 'markdown')
+                logger.info(f"{url}页面保存为Markdown成功")
+
+                return True
+        
+        def _save_html_post(post, page: Page):
+                category, url, title = post[0], post[1], post[2]
+                try:
+                    page = _safe_load_page(post)
+                except playwright._impl._errors.TimeoutError as e:
+                    logger.error(f"打开{url}页面时发生超时异常: {e}")
+                    return False
+                except Exception as e:
+                    logger.error(f"打开{url}页面时发生异常: {e}")
+                    return False
+                if page is None:
+                    return duplicate # 正文近似重复, 不需要保存
+                with self._measure('content', url):
+                    page_html = self.page.content()
+                _store_post(post, page_html, 'html')
+                logger.info(f"{post[1]}页面保存为html成功")
+
+                return True
+        
+        def _save_pdf_post(post, page: Page):
+                category, url, title = post[0], post[1], post[2]
+                try:
+                    page = _safe_load_page(post)
+                except playwright._impl._errors.TimeoutError as e:
+                    logger.error(f"打开{url}页面时发生超时异常: {e}")
+                    return False
+                except Exception as e:
+                    logger.error(f"打开{url}页面时发生异常: {e}")
+                    return False
+                if page is None:
+                    return duplicate # 正文近似重复, 不需要保存
+                with self._measure('pdf', url):
+                    page_pdf = self.page.pdf()
+                _store_post(post, page_pdf, 'pdf')
+                logger.info(f"{post[1]}页面保存为PDF成功")
+
+                return True
+        
+        # 从实例的文章列表取出链接
+        # 先对分区进行去重
+        table = self._posts_list
+        categories = table['分区']
+        categories = list(set(categories))
+        for category in categories if archive is None else ():
+            # 一个一个创建目录, 写入归档时不需要
+            output_dir = output_path / safe_filename(category)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        output_methods = {
+            'markdown': _save_md_post,
+            'html': _save_html_post,
+            'pdf': _save_pdf_post
+        }
+        output_mode = output_mode.lower()
+        curr_output_method =  output_methods[output_mode]
+        logger.debug(f"开始保存文章, 导出模式为{output_mode}...")
+        logger.debug(f"共{len(table)}篇文章需要保存...")
+        with alive_bar(len(table), bar='blocks', spinner='elements') as bar:
+            for post in table:
+                if archive is not None and archive.has(post[1], output_mode):
+                    # 同一篇文章出现在多个分区时, 只补充路径视图, 不再重新打开和渲染
+                    archive.add_path(_post_path(post, output_mode), post[1], output_mode)
+                    logger.info(f"{post[1]}已存在于归档中, 跳过保存")
+                    bar()
+                    continue
+                # 在打开页面之前用标题+描述查找已保存的近似重复文章
+                text = f"{post[2]} {post[5]}"
+                if self._dedup is not None:
+                    original = post[1] if post[1] in self._dedup else self._dedup.find(text)
+                    if original is not None:
+                        self.near_duplicates[(post[0], post[1])] = original
+                        if archive is not None and archive.has(original, output_mode):
+                            archive.add_path(_post_path(post, output_mode), original, output_mode)
+                        logger.info(f"{post[1]}与已保存的{original}近似重复, 跳过保存")
+                        bar()
+                        continue
+                try:
+                    with self._trace(post[1]):
+                        saved = curr_output_method(post, self.page)
+                    if saved is duplicate:
+                        pass
+                    elif not saved:
+                        logger.warning(f"{post[1]}页面保存失败")
+                    else:
+                        # 只收录保存成功的文章, 跳过或失败的文章不能成为别人的"原文"
+                        if self._dedup is not None:
+                            self._dedup.add(post[1], text)
+                        if post[1] in pending_bodies:
+                            body_dedup.add(post[1], pending_bodies[post[1]])
+                except Exception as e:
+                    logger.error(f"{post[1]}页面保存失败, 错误信息: {e}")
+                finally:
+                    pending_bodies.pop(post[1], None)
+                bar()
+        if self.near_duplicates:
+            logger.info(f"共跳过{len(self.near_duplicates)}篇近似重复的文章")
+        if self._profiler is not None:
+            logger.info(f"慢操作分析报告:\n{self._profiler.report()}")
+
+
+async def _iterate_in_thread(make_iterator: Callable[[], Iterator],
+                             buffer: int = stream_buffer_size,
+                             name: str = 'crawler') -> AsyncIterator:
+    """在后台线程里驱动一个同步迭代器, 把产出的数据通过有界队列交给异步调用方
+
+    Playwright的同步API不能在运行中的事件循环里调用, 所以整个同步爬取放到线程里;
+    队列满时线程阻塞在put上, 调用方停止消费时线程会在下一行之前退出.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=buffer)
+    stop = threading.Event()
+    done = object() # 结束标记
+
+    def put(item):
+        # 阻塞直到事件循环把数据放进队列, 这就是背压
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def worker():
+        try:
+            iterator = make_iterator()
+            try:
+                for item in iterator:
+                    put(item)
+                    if stop.is_set():
+                        break # 放进队列后再检查, 调用方停止后不会再多推进迭代器
+            finally:
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close() # 让生成器执行自己的finally, 例如关闭浏览器
+        except BaseException as e:
+            if not stop.is_set():
+                put(e)
+            return
+        if not stop.is_set():
+            put(done)
+
+    thread = threading.Thread(target=worker, name=f"{name}-stream", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # 清空队列, 让可能阻塞在put上的线程继续走到stop检查
+        while not queue.empty():
+            queue.get_nowait()
+        await asyncio.to_thread(thread.join)
+
+def _check_max_pages(max_pages: int | None):
+    if max_pages is not None and max_pages < 1:
+        raise ValueError(f"max_pages必须是正整数或None(不限页数), 实际为{max_pages}")
+
+async def stream_articles(spec: SiteSpec | str | Path = None,
+                          categories: Iterable[str] | dict[str, str] = None,
+                          max_pages: int | None = 1,
+                          buffer: int = stream_buffer_size,
+                          headless: bool = True,
+                          launch_options: dict = None,
+                          context_options: dict = None,
+                          crawler_factory: Callable[[Playwright], SiteCrawler] = None,
+                          **crawler_kwargs,
+                          ) -> AsyncIterator[ArticleRow]:
+    """异步流式爬取文章列表
+        async for row in stream_articles('hackernews', ['Cyber Attacks'], max_pages=3):
+            ...
+
+    同步爬取在后台线程里运行, 浏览器、上下文和页面都在那个线程里创建,
+    所以不能把已有的SiteCrawler直接交给它: 需要cookie、代理等设置时用context_options,
+    需要完全自定义时传入crawler_factory, 它在后台线程里用Playwright实例创建爬虫.
+    已经在当前线程里使用同步API的代码直接用 crawler.iter_articles 即可.
+
+    注意: 同步API启动后会占用所在线程的事件循环, 在这样的线程里asyncio.run会失败,
+    因此不能在已经运行sync_playwright的线程(包括pytest-playwright的测试线程)里驱动本函数.
+    Args:
+        spec (SiteSpec | str | Path, optional): 站点描述, 或内置站点名/YAML文件路径; 传入crawler_factory时可省略
+        categories (Iterable[str] | dict[str, str], optional): 同SiteCrawler.iter_articles
+        max_pages (int | None, optional): 每个分区最多翻几页, 默认1; None表示一直翻到最后一页
+        buffer (int, optional): 缓冲的行数, 调用方处理不过来时爬虫会等待
+        headless (bool, optional): 是否无头启动浏览器
+        launch_options (dict, optional): 传给chromium.launch的其他参数, 如proxy、args
+        context_options (dict, optional): 传给browser.new_context的参数, 如storage_state、user_agent
+        crawler_factory (Callable[[Playwright], SiteCrawler], optional): 自定义创建爬虫,
+            它启动的浏览器在Playwright停止时关闭
+        **crawler_kwargs: 传给SiteCrawler的其他参数, 如dedup、profiler
+    Yields:
+        ArticleRow: 文章列表的数据行, 提取出来后立刻产出
+    Raises:
+        ValueError: 既没有spec也没有crawler_factory, 或max_pages小于1
+    """
+    _check_max_pages(max_pages)
+    if crawler_factory is None:
+        if spec is None:
+            raise ValueError("需要传入spec或crawler_factory")
+        spec = spec if isinstance(spec, SiteSpec) else load_spec(spec)
+    elif spec is not None or crawler_kwargs:
+        raise ValueError("传入crawler_factory时, spec和SiteCrawler的参数应由工厂自己处理")
+    categories = dict(categories) if isinstance(categories, dict) else (
+        None if categories is None else list(categories)
+    )
+
+    def crawl():
+        # 浏览器在后台线程里创建和关闭, 同步API的对象不能跨线程使用
+        with sync_playwright() as p:
+            if crawler_factory is not None:
+                crawler = crawler_factory(p)
+                yield from crawler.iter_articles(categories, max_pages=max_pages)
+                return
+            browser = p.chromium.launch(headless=headless, **(launch_options or {}))
+            try:
+                context = browser.new_context(**(context_options or {}))
+                crawler_kwargs.setdefault('table', ArticleTable(article_headers))
+                crawler = SiteCrawler(spec, page=context.new_page(), **crawler_kwargs)
+                yield from crawler.iter_articles(categories, max_pages=max_pages)
+            finally:
+                browser.close()
+
+    name = spec.name if spec is not None else 'crawler'
+    # 调用方提前停止时显式关闭内层流, 立即结束后台线程并关闭浏览器, 不等垃圾回收
+    async with aclosing(_iterate_in_thread(crawl, buffer=buffer, name=name)) as rows:
+        async for row in rows:
+            yield row
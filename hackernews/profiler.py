@@ -0,0 +1,187 @@
+# 标准模块
+import contextlib
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# 第三方模块
+from loguru import logger # 日志库
+from playwright.sync_api import BrowserContext # Playwright同步API
+
+slow_threshold_ms = 500 # 超过500毫秒的操作记为慢操作
+trace_sample_rate = 0.05 # 默认只对5%的页面录制trace
+max_slow_records = 1000 # 慢操作明细最多保留的条数, 超出后只保留最慢的
+max_tracked = 1000 # 选择器和页面统计各自最多保留的条数, 超出后只保留总耗时最多的
+reservoir_size = 256 # 每个统计项用于估算p95的耗时样本数
+
+_this_file = Path(__file__).resolve()
+_skip_files = {str(_this_file), contextlib.__file__}
+_reservoir_random = random.Random(0) # 蓄水池抽样用的随机数, 固定种子便于复现
+
+
+@dataclass(slots=True)
+class SlowOperation:
+    """一次慢操作的明细"""
+    op: str # 操作类型, 如goto、locator、expect、pdf
+    selector: str # 选择器或URL
+    page_url: str # 发生时所在的页面
+    elapsed_ms: float
+    call_site: str # 调用位置, 文件名:行号 函数名
+
+
+@dataclass(slots=True)
+class _Stats:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    samples: list[float] = field(default_factory=list) # 蓄水池抽样, 最多reservoir_size个
+
+    def add(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if len(self.samples) < reservoir_size:
+            self.samples.append(elapsed_ms)
+            return
+        # 每个耗时以相同的概率留在样本里, 内存不随调用次数增长
+        index = _reservoir_random.randrange(self.count)
+        if index < reservoir_size:
+            self.samples[index] = elapsed_ms
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def _call_site() -> str:
+    # 跳过本模块和contextlib的栈帧, 找到真正发起操作的代码位置
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in _skip_files:
+        frame = frame.f_back
+    if frame is None:
+        return '<unknown>'
+    return f"{Path(frame.f_code.co_filename).name}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _prune(stats: dict):
+    # 导航的选择器就是URL, 页面也按URL统计, 长时间爬取时会无限增长;
+    # 与慢操作明细一样, 积攒到两倍上限后一次性只保留总耗时最多的
+    if len(stats) <= max_tracked * 2:
+        return
+    ranked = sorted(stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+    stats.clear()
+    stats.update(ranked[:max_tracked])
+
+
+class OperationProfiler:
+    """可选的慢操作分析器
+
+    对定位器调用、等待和页面导航计时, 超过阈值的操作连同选择器和调用位置一起记录;
+    按sample_rate对一部分页面录制Playwright trace, 生产环境下也不用全量录制.
+    最后用report输出最慢的选择器和页面排行.
+    """
+    def __init__(self,
+                 threshold_ms: float = slow_threshold_ms, # 慢操作阈值
+                 sample_rate: float = trace_sample_rate, # 录制trace的页面比例, 0表示不录制
+                 trace_dir: Path = None, # trace文件的保存目录
+                 seed: int = None # 采样的随机种子, 便于复现
+                 ):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate必须在[0, 1]之间")
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.trace_dir = Path(trace_dir) if trace_dir is not None else Path(__file__).parent / 'traces'
+        self._random = random.Random(seed)
+        self._selectors = defaultdict(_Stats) # (操作, 选择器) -> 统计
+        self._pages = defaultdict(_Stats) # 页面URL -> 统计
+        self.slow_operations: list[SlowOperation] = [] # 明细只保留最慢的一部分
+        self.slow_count = 0 # 慢操作的总次数, 不受明细裁剪影响
+        self.traces: list[Path] = [] # 已保存的trace文件
+
+    @contextlib.contextmanager
+    def measure(self, op: str, selector: str = '', page_url: str = ''):
+        """计时一次操作
+        Args:
+            op (str): 操作类型
+            selector (str, optional): 选择器, 导航时为目标URL
+            page_url (str, optional): 当前所在页面, 用于页面排行
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._selectors[(op, selector)].add(elapsed_ms)
+            _prune(self._selectors)
+            if page_url:
+                self._pages[page_url].add(elapsed_ms)
+                _prune(self._pages)
+            if elapsed_ms >= self.threshold_ms:
+                self._record_slow(SlowOperation(op, selector, page_url, elapsed_ms, _call_site()))
+
+    def _record_slow(self, record: SlowOperation):
+        logger.debug(
+            f"慢操作: {record.op} {record.selector} 耗时{record.elapsed_ms:.0f}ms, 位置{record.call_site}"
+        )
+        self.slow_count += 1
+        self.slow_operations.append(record)
+        if len(self.slow_operations) > max_slow_records * 2:
+            # 积攒到两倍上限后一次性裁剪, 避免每次都排序
+            self.slow_operations.sort(key=lambda r: r.elapsed_ms, reverse=True)
+            del self.slow_operations[max_slow_records:]
+
+    @contextlib.contextmanager
+    def trace(self, context: BrowserContext, name: str):
+        """按采样比例为一个页面录制Playwright trace
+        Args:
+            context (BrowserContext): 页面所在的浏览器上下文
+            name (str): trace文件名, 一般用页面URL
+        """
+        if self.sample_rate == 0 or self._random.random() >= self.sample_rate:
+            yield None
+            return
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]+', '_', name)[-100:]
+        path = self.trace_dir / f"{len(self.traces):05d}-{safe_name}.zip"
+        context.tracing.start(screenshots=True, snapshots=True)
+        try:
+            yield path
+        finally:
+            context.tracing.stop(path=path)
+            self.traces.append(path)
+            logger.info(f"已保存{name}的trace: {path}")
+
+    def slowest_selectors(self, top: int = 10) -> list[tuple[str, str, _Stats]]:
+        """按总耗时排序的选择器排行"""
+        ranked = sorted(self._selectors.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return [(op, selector, stats) for (op, selector), stats in ranked[:top]]
+
+    def slowest_pages(self, top: int = 10) -> list[tuple[str, _Stats]]:
+        """按总耗时排序的页面排行"""
+        return sorted(self._pages.items(), key=lambda item: item[1].total_ms, reverse=True)[:top]
+
+    def report(self, top: int = 10) -> str:
+        """生成最慢选择器和页面的排行报告"""
+        lines = [f"最慢的{top}个选择器(按总耗时):"]
+        for op, selector, stats in self.slowest_selectors(top):
+            lines.append(
+                f"  {stats.total_ms:10.0f}ms 共{stats.count}次 平均{stats.total_ms / stats.count:.0f}ms "
+                f"p95 {stats.p95_ms:.0f}ms 最大{stats.max_ms:.0f}ms  {op} {selector}"
+            )
+        lines.append(f"最慢的{top}个页面(按总耗时):")
+        for url, stats in self.slowest_pages(top):
+            lines.append(f"  {stats.total_ms:10.0f}ms 共{stats.count}次操作  {url}")
+        slow = sorted(self.slow_operations, key=lambda r: r.elapsed_ms, reverse=True)[:top]
+        lines.append(f"超过{self.threshold_ms:.0f}ms的慢操作共{self.slow_count}次, 最慢的{len(slow)}次:")
+        for record in slow:
+            lines.append(
+                f"  {record.elapsed_ms:10.0f}ms  {record.op} {record.selector}  {record.call_site}  {record.page_url}"
+            )
+        if self.traces:
+            lines.append(f"已录制{len(self.traces)}个trace, 可用 playwright show-trace <文件> 查看")
+        return '\n'.join(lines)
@@ -0,0 +1,198 @@
+# 标准模块
+import re
+import sys
+from array import array # 页码和日期按列存成定长整数数组
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Iterable, Iterator, Sequence
+
+# 第三方模块
+import tablib # Tablib用于数据表格处理
+from loguru import logger # 日志库
+
+
+# 列表页上的日期前面可能带着图标字体的字符, 先从文本里找出日期部分再解析
+_date_pattern = re.compile(r"[A-Za-z]{3,9}\.? \d{1,2}, \d{4}|\d{4}-\d{2}-\d{2}")
+
+def _strptime(text: str, date_format: str = None) -> date:
+    if date_format:
+        return datetime.strptime(text, date_format).date()
+    return date.fromisoformat(text)
+
+def parse_date(text: str, date_format: str = None) -> date | None:
+    """把列表页上的日期文本解析为date
+    Args:
+        text (str): 日期文本, 如"Oct 18, 2026", 前后可以有图标等其他字符
+        date_format (str, optional): strptime格式, 不指定时只尝试ISO格式
+    Returns:
+        date | None: 没有日期或解析失败时为None, 解析失败的原始文本记录在警告日志里
+    """
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return _strptime(text, date_format)
+    except ValueError:
+        pass
+    match = _date_pattern.search(text)
+    if match is not None:
+        for fmt in (date_format, None):
+            try:
+                return _strptime(match.group(), fmt)
+            except ValueError:
+                continue
+    logger.warning(f"无法按{date_format or 'ISO格式'}解析日期{text!r}, 日期记为空")
+    return None
+
+def _date_column(value: date | None) -> str:
+    # 表格里的日期列统一为ISO字符串, 缺失时为空字符串, 排序和导出都不会混入不同类型
+    return value.isoformat() if value is not None else ''
+
+
+@dataclass(slots=True)
+class ArticleRow:
+    """文章列表中的一行, 字段顺序与表格的列(article_headers)一致
+
+    分区和标签这类大量重复的字符串会被intern, 所有行共享同一个字符串对象.
+    行本身可以迭代和按下标访问, 得到的是表格的列值(日期为ISO字符串),
+    所以也能直接append到tablib表格里. 爬虫长期保存的是按列存储的ArticleTable, 数据行只在传递时存在.
+    """
+    category: str # 分区
+    link: str # 链接
+    title: str # 标题
+    date: date | None # 日期, 没有或解析失败时为None
+    tags: str # 标签
+    desc: str # 描述
+    page: int # 页码
+
+    def __post_init__(self):
+        self.category = sys.intern(self.category)
+        self.tags = sys.intern(self.tags)
+
+    @classmethod
+    def from_post(cls, category: str, post: dict[str, str], page: int, date_format: str = None):
+        """由页面内提取函数返回的dict创建一行"""
+        return cls(
+            category,
+            post['link'],
+            post['title'],
+            parse_date(post['date'], date_format),
+            post['tags'],
+            post['desc'],
+            int(page),
+        )
+
+    def _column(self, name: str):
+        value = getattr(self, name)
+        return _date_column(value) if name == 'date' else value
+
+    def __len__(self):
+        return len(_field_names)
+
+    def __iter__(self):
+        return (self._column(name) for name in _field_names)
+
+    def __getitem__(self, index: int):
+        # 兼容原来 post[1] 这样按列下标访问的写法
+        if isinstance(index, slice):
+            return [self._column(name) for name in _field_names[index]]
+        return self._column(_field_names[index])
+
+    def to_list(self) -> list:
+        """转换为tablib表格的一行"""
+        return list(self)
+
+
+_field_names = tuple(f.name for f in fields(ArticleRow))
+
+
+class ArticleTable:
+    """按列存储的文章列表
+
+    tablib会把每一行复制成自己的list, 行数多时每行的list和行对象开销占了大头.
+    这里每一列是一个list(字符串列, 分区和标签是intern过的共享对象)或整数数组(页码和日期的序数),
+    每行只占各列里的一个槽位. 只在导出时才用to_dataset转换成tablib表格.
+    保留了爬虫用到的Dataset接口: append、remove_duplicates、按列名取列、迭代、len和export.
+    """
+    def __init__(self, headers: Sequence[str], rows: Iterable[Sequence] = ()):
+        if len(headers) != len(_field_names):
+            raise ValueError(f"文章表格需要{len(_field_names)}列, 实际为{len(headers)}列")
+        self.headers = list(headers)
+        self._columns = {name: [] for name in _field_names}
+        self._columns['date'] = array('l') # 日期的序数, 0表示没有日期
+        self._columns['page'] = array('l')
+        for row in rows:
+            self.append(row)
+
+    def append(self, row: Sequence):
+        """追加一行, 可以是ArticleRow或按列顺序排列的序列(日期为date、ISO字符串或空)"""
+        category, link, title, day, tags, desc, page = (
+            (getattr(row, name) for name in _field_names) if isinstance(row, ArticleRow) else row
+        )
+        if isinstance(day, str):
+            day = date.fromisoformat(day) if day else None
+        columns = self._columns
+        columns['category'].append(sys.intern(category))
+        columns['link'].append(link)
+        columns['title'].append(title)
+        columns['date'].append(day.toordinal() if day is not None else 0)
+        columns['tags'].append(sys.intern(tags))
+        columns['desc'].append(desc)
+        columns['page'].append(int(page))
+
+    def _row(self, index: int) -> ArticleRow:
+        values = [self._columns[name][index] for name in _field_names]
+        values[3] = date.fromordinal(values[3]) if values[3] else None
+        return ArticleRow(*values)
+
+    def __len__(self):
+        return len(self._columns['link'])
+
+    def __iter__(self) -> Iterator[ArticleRow]:
+        # 按需创建数据行, 迭代时不会一次性复制整个表格
+        return (self._row(index) for index in range(len(self)))
+
+    def __getitem__(self, key: int | str):
+        """按下标取一行(ArticleRow), 或按列名取一整列(与tablib一致, 日期列为ISO字符串)"""
+        if isinstance(key, str):
+            name = _field_names[self.headers.index(key)]
+            return self._iso_dates() if name == 'date' else list(self._columns[name])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return self._row(key)
+
+    def _iso_dates(self) -> list[str]:
+        return [_date_column(date.fromordinal(o) if o else None) for o in self._columns['date']]
+
+    def remove_duplicates(self):
+        """去除完全相同的行, 保留第一次出现的顺序"""
+        seen = set()
+        keep = []
+        for index, values in enumerate(zip(*self._columns.values())):
+            if values not in seen:
+                seen.add(values)
+                keep.append(index)
+        if len(keep) == len(self):
+            return
+        for name, column in self._columns.items():
+            kept = [column[index] for index in keep]
+            self._columns[name] = array(column.typecode, kept) if isinstance(column, array) else kept
+
+    def to_dataset(self) -> tablib.Dataset:
+        """转换为tablib表格, 用于导出xlsx、csv等格式"""
+        columns = [self._iso_dates() if name == 'date' else self._columns[name] for name in _field_names]
+        return tablib.Dataset(*zip(*columns), headers=self.headers)
+
+    def export(self, format: str, **kwargs):
+        """同tablib.Dataset.export, 先转换为tablib表格再导出"""
+        return self.to_dataset().export(format, **kwargs)
+
+
+def rows_to_dataset(rows: Iterable[ArticleRow], headers: list[str]) -> tablib.Dataset:
+    """把数据行装入新的tablib表格, 用于导出xlsx、csv等格式"""
+    dataset = tablib.Dataset(headers=headers)
+    for row in rows:
+        dataset.append(row)
+    return dataset
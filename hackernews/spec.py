@@ -0,0 +1,130 @@
+# 标准模块
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# 第三方模块
+import yaml # 站点描述文件使用YAML格式
+from cachetools import cached, LRUCache # 缓存库
+
+specs_path = Path(__file__).parent / 'specs' # 内置站点描述文件目录
+row_fields = ('link', 'title', 'date', 'tags', 'desc') # 每个站点都必须提供的文章字段, 对应表格的列
+# 一次调用取回整个分区菜单的名称和链接
+menu_extractor = "(elements) => elements.map(el => [el.innerText, el.getAttribute('href')])"
+
+
+@dataclass(slots=True, frozen=True)
+class FieldSpec:
+    """文章列表中单个字段的提取规则"""
+    selector: str # 相对于文章条目的CSS选择器, 为空表示条目本身
+    attr: str = None # 读取的属性名, 为空时读取innerText
+    default: str = '' # 元素不存在时的默认值
+    max_length: int = None # 截取的最大长度
+    format: str = None # 日期字段的strptime格式, 提取后在Python中解析为date
+
+
+@dataclass(slots=True, frozen=True)
+class SiteSpec:
+    """一个新闻站点的描述: 分区菜单、文章列表、翻页和字段选择器"""
+    name: str
+    target: str # 站点首页
+    menu: str # 分区菜单容器的CSS选择器
+    item: str # 文章列表中单个文章条目的CSS选择器
+    next_text: str # 下一页按钮的文本
+    prev_text: str # 上一页按钮的文本
+    fields: tuple[tuple[str, FieldSpec], ...] # (字段名, 提取规则), 用tuple保证描述可哈希, 便于缓存
+    menu_link: str = 'a' # 分区菜单中链接的选择器
+    exclude_suffixes: tuple[str, ...] = () # 链接以这些后缀结尾的分区没有文章列表
+    exclude: tuple[str, ...] = () # 需要剔除的分区名
+    listing_timeout: int = 30 * 1000 # 等待文章列表加载的超时时间(毫秒)
+    article_body: str = None # 文章详情页正文容器的选择器, 用于正文去重
+    source: str = field(default='', compare=False) # 描述文件路径, 仅用于日志
+
+
+def _require(section: dict, key: str, where: str):
+    if key not in section:
+        raise ValueError(f"站点描述缺少{where}.{key}")
+    return section[key]
+
+def _section(data: dict, key: str, required: bool = True) -> dict:
+    # YAML中只写了键没写内容(如 article:)时值为None, 和没写一样处理
+    value = _require(data, key, 'spec') if required else data.get(key)
+    if value is None and not required:
+        return {}
+    if not isinstance(value, dict):
+        raise ValueError(f"站点描述的spec.{key}必须是映射, 实际为{type(value).__name__}")
+    return value
+
+def parse_spec(data: dict, source: str = '') -> SiteSpec:
+    """把YAML解析出的dict转换为SiteSpec
+    Raises:
+        ValueError: 缺少必要的配置项, 或配置项的类型不对(包括空文件)
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"站点描述{source}必须是YAML映射, 实际为{type(data).__name__}")
+    categories = _section(data, 'categories')
+    listing = _section(data, 'listing')
+    pagination = _section(data, 'pagination')
+    raw_fields = _section(data, 'fields')
+    missing = [name for name in row_fields if name not in raw_fields]
+    if missing:
+        raise ValueError(f"站点描述缺少字段: {', '.join(missing)}")
+    fields = []
+    for name, raw in raw_fields.items():
+        if isinstance(raw, str):
+            raw = {'selector': raw} # 简写: 字段直接写选择器
+        elif not isinstance(raw, dict):
+            raise ValueError(f"站点描述的字段{name}必须是选择器或映射")
+        fields.append((name, FieldSpec(
+            selector=raw.get('selector', ''),
+            attr=raw.get('attr'),
+            default=str(raw.get('default', '')),
+            max_length=raw.get('max_length'),
+            format=raw.get('format'),
+        )))
+    return SiteSpec(
+        name=_require(data, 'name', 'spec'),
+        target=_require(data, 'target', 'spec'),
+        menu=_require(categories, 'menu', 'categories'),
+        menu_link=categories.get('link', 'a'),
+        exclude_suffixes=tuple(categories.get('exclude_suffixes', ())),
+        exclude=tuple(categories.get('exclude', ())),
+        item=_require(listing, 'item', 'listing'),
+        listing_timeout=listing.get('timeout', 30 * 1000),
+        next_text=_require(pagination, 'next_text', 'pagination'),
+        prev_text=_require(pagination, 'prev_text', 'pagination'),
+        fields=tuple(fields),
+        article_body=_section(data, 'article', required=False).get('body'),
+        source=source,
+    )
+
+@cached(LRUCache(maxsize=32), key=lambda name: str(name))
+def load_spec(name: str | Path) -> SiteSpec:
+    """加载站点描述, 同一个描述只解析一次
+    Args:
+        name (str | Path): 内置站点名(如hackernews)或YAML文件路径
+    """
+    path = Path(name)
+    if path.suffix not in ('.yaml', '.yml'):
+        path = specs_path / f"{name}.yaml"
+    with open(path, encoding='utf-8') as f:
+        return parse_spec(yaml.safe_load(f), source=str(path))
+
+def _field_js(spec: FieldSpec) -> str:
+    element = f"el.querySelector({json.dumps(spec.selector)})" if spec.selector else "el"
+    value = f"node.getAttribute({json.dumps(spec.attr)})" if spec.attr else "node.innerText"
+    clip = f".slice(0, {int(spec.max_length)})" if spec.max_length else ""
+    default = json.dumps(spec.default)
+    return f"(() => {{ const node = {element}; const v = node ? {value} : null; return v == null ? {default} : v{clip}; }})()"
+
+@cached(LRUCache(maxsize=32))
+def compile_extractor(spec: SiteSpec) -> str:
+    """把字段规则编译成一个页面内执行的JS函数
+
+    配合 locator.evaluate_all 使用, 一次调用就返回当前页所有文章的所有字段,
+    不用再对每篇文章的每个字段各发一次定位器请求.
+    """
+    body = ', '.join(
+        f"{json.dumps(name)}: {_field_js(field_spec)}" for name, field_spec in spec.fields
+    )
+    return f"(elements) => elements.map(el => ({{{body}}}))"
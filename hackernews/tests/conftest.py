@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews.spec import menu_extractor
+
+
+class StubLocator:
+    """只实现爬虫用到的几个Locator方法"""
+    def __init__(self, page, selector: str):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    @property
+    def last(self):
+        return self
+
+    def locator(self, selector: str):
+        return StubLocator(self.page, f"{self.selector} >> {selector}")
+
+    def all(self) -> list:
+        return [self] * len(self.page.menu)
+
+    def count(self) -> int:
+        return 1 if self.page.url in self.page.bodies else 0
+
+    def inner_text(self) -> str:
+        return self.page.bodies[self.page.url]
+
+    def evaluate_all(self, script: str) -> list:
+        if script == menu_extractor:
+            return [[name, href] for name, href in self.page.menu.items()]
+        return [dict(post) for post in self.page.current_listing()]
+
+    def is_visible(self) -> bool:
+        if self.selector == f"text={self.page.next_text}":
+            return self.page.listing_index + 1 < len(self.page.listings.get(self.page.url, ()))
+        if self.page.url in self.page.listings:
+            return bool(self.page.current_listing()) # 列表页上等待的是最后一篇文章
+        return True # 首页的分区菜单
+
+    def click(self):
+        if self.selector == f"text={self.page.next_text}":
+            self.page.listing_index += 1
+            self.page.clicks += 1
+            self.page.events.append('click')
+
+
+class StubPage:
+    """不启动浏览器的假页面, 记录访问过的URL, 正文、PDF和文章列表由URL决定
+    Args:
+        bodies (dict[str, str]): URL -> 文章正文
+        broken (set[str]): 渲染PDF时会失败的URL
+        menu (dict[str, str]): 分区菜单, 分区名 -> 链接
+        listings (dict[str, list[list[dict]]]): 分区链接 -> 每一页的文章字段
+    """
+    next_text = 'Next Page'
+
+    def __init__(self, bodies: dict[str, str] = None, broken: set[str] = (),
+                 menu: dict[str, str] = None, listings: dict[str, list[list[dict]]] = None):
+        self.bodies = bodies or {}
+        self.broken = set(broken)
+        self.menu = menu or {}
+        self.listings = listings or {}
+        self.url = 'about:blank'
+        self.listing_index = 0
+        self.clicks = 0
+        self.visited = []
+        self.events = [] # 导航、点击和trace开始/结束的先后顺序
+        self.context = SimpleNamespace(tracing=SimpleNamespace(
+            start=lambda **kwargs: self.events.append('trace-start'),
+            stop=lambda path: self.events.append('trace-stop'),
+        ))
+
+    def goto(self, url: str):
+        self.url = url
+        self.listing_index = 0
+        self.visited.append(url)
+        self.events.append('goto')
+
+    def current_listing(self) -> list[dict]:
+        pages = self.listings.get(self.url, ())
+        return pages[self.listing_index] if self.listing_index < len(pages) else []
+
+    def locator(self, selector: str):
+        return StubLocator(self, selector)
+
+    def get_by_text(self, text: str):
+        return StubLocator(self, f"text={text}")
+
+    def content(self) -> str:
+        return f"<html><body>{self.bodies.get(self.url, self.url)}</body></html>"
+
+    def pdf(self) -> bytes:
+        if self.url in self.broken:
+            raise RuntimeError(f"{self.url}渲染失败")
+        return f"%PDF {self.bodies.get(self.url, self.url)}".encode('utf-8')
+
+
+def _stub_expect(locator: StubLocator):
+    # 与Playwright的expect一致, 元素不可见时抛出AssertionError
+    def to_be_visible(timeout: float = None):
+        if not locator.is_visible():
+            raise AssertionError(f"{locator.selector}不可见")
+    return SimpleNamespace(to_be_visible=to_be_visible)
+
+
+@pytest.fixture
+def stub_page(monkeypatch: pytest.MonkeyPatch):
+    # Playwright的expect只接受真正的Page和Locator, 换成按假页面状态判断的版本
+    monkeypatch.setattr('hackernews.engine.expect', _stub_expect)
+    return StubPage
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews.archive import ArticleArchive, safe_filename
+
+url = "https://thehackernews.com/2025/01/example.html"
+
+def test_safe_filename():
+    # 标题里的/和?会被当成路径分隔符和查询参数, 必须去掉
+    assert safe_filename("Who's Behind It? A/B Test") == "Who's-Behind-It-AB-Test"
+    assert safe_filename("..") == "untitled"
+
+def test_put_and_get(tmp_path: Path):
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        archive.put(url, "<html>正文</html>" * 100, 'html', path="Cyber-Attacks/example.html")
+        assert archive.has(url, 'html')
+        assert not archive.has(url, 'pdf')
+        assert archive.get(url).decode('utf-8') == "<html>正文</html>" * 100
+        assert archive.read_path("Cyber-Attacks/example.html") == archive.get(url, 'html')
+        stats = archive.stats()
+        assert stats['stored_bytes'] < stats['raw_bytes']
+        with pytest.raises(KeyError):
+            archive.get("https://thehackernews.com/missing.html")
+
+def test_same_content_stored_once(tmp_path: Path):
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        archive.put(url, b"same", 'pdf', path="Cyber-Attacks/example.pdf")
+        archive.add_path("Vulnerabilities/example.pdf", url, 'pdf')
+        archive.put(url + "?m=1", b"same", 'pdf')
+        assert archive.stats()['blobs'] == 1
+        assert archive.paths("Vulnerabilities") == ["Vulnerabilities/example.pdf"]
+        assert archive.export(tmp_path / 'view') == 2
+        assert (tmp_path / 'view' / 'Vulnerabilities' / 'example.pdf').read_bytes() == b"same"
+
+def test_empty_archive_has_no_segments(tmp_path: Path):
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        assert archive.stats()['segments'] == 0
+        archive.put(url, b"x", 'pdf')
+        assert archive.stats()['segments'] == 1
+
+def test_segments_roll_and_reopen(tmp_path: Path):
+    contents = {f"{url}?p={i}": bytes([i]) * 1000 + b"x" * i for i in range(10)}
+    with ArticleArchive(tmp_path, segment_size=64, codec='zlib') as archive:
+        for key, content in contents.items():
+            archive.put(key, content, 'pdf')
+        assert archive.stats()['segments'] > 1
+    # 重新打开后仍然能按URL随机读取
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        for key in reversed(contents):
+            assert archive.get(key) == contents[key]
+
+def test_colliding_paths_get_suffix(tmp_path: Path):
+    # "A/B"和"AB"经过safe_filename后是同一个文件名
+    first, second = url, "https://thehackernews.com/2025/01/other.html"
+    path = f"Cyber-Attacks/{safe_filename('A/B')}.pdf"
+    assert path == f"Cyber-Attacks/{safe_filename('AB')}.pdf"
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        archive.put(first, b"first", 'pdf', path=path)
+        archive.put(second, b"second", 'pdf', path=path)
+        assert archive.read_path(path) == b"first"
+        paths = archive.paths()
+        assert len(paths) == 2
+        other = next(p for p in paths if p != path)
+        assert other.startswith("Cyber-Attacks/AB-") and other.endswith(".pdf")
+        assert archive.read_path(other) == b"second"
+        # 同一篇文章再次绑定同一路径时沿用已分配的路径, 不会继续加后缀
+        assert archive.add_path(path, second, 'pdf') == other
+        assert archive.add_path(path, first, 'pdf') == path
+        assert archive.export(tmp_path / 'view') == 2
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews.dedup import MinHasher, NearDuplicateIndex, similarity, similarity_threshold
+
+title = "Critical Flaw in Popular VPN Appliance Exploited in the Wild to Deploy Backdoors"
+desc = "Threat actors are actively exploiting a newly disclosed vulnerability in"
+
+def test_similar_texts_have_close_signatures():
+    hasher = MinHasher()
+    base = hasher.signature(f"{title} {desc}")
+    updated = hasher.signature(f"{title.replace('Backdoors', 'Backdoor')} {desc}")
+    unrelated = hasher.signature(
+        "Critical Flaw in Popular Email Client Exploited to Steal Credentials Threat actors are exploiting"
+    )
+    assert similarity(base, updated) >= similarity_threshold
+    assert similarity(base, unrelated) < similarity_threshold
+
+def test_index_marks_near_duplicates():
+    index = NearDuplicateIndex()
+    assert index.add("https://thehackernews.com/a.html", f"{title} {desc}") is None
+    # 同一篇文章换了个URL和大小写, 应该被识别出来
+    duplicate = index.add("https://thehackernews.com/a.html?m=1", f"{title.upper()} {desc[:40]}")
+    assert duplicate == "https://thehackernews.com/a.html"
+    assert len(index) == 1
+    assert index.add("https://thehackernews.com/b.html", "Unrelated ransomware gang arrested in Europe") is None
+    assert "https://thehackernews.com/b.html" in index
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=0)
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=64, num_bands=10)
@@ -0,0 +1,88 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews import profiler as profiler_module
+from hackernews.engine import SiteCrawler
+from hackernews.profiler import OperationProfiler
+
+def test_slow_operations_are_ranked():
+    profiler = OperationProfiler(threshold_ms=5, sample_rate=0)
+    with profiler.measure('inner_text', 'xpath=//h2[@class="home-title"]', 'https://thehackernews.com/'):
+        time.sleep(0.02)
+    for _ in range(3):
+        with profiler.measure('get_attribute', 'xpath=./a[@class="story-link"]', 'https://thehackernews.com/'):
+            pass
+    op, selector, stats = profiler.slowest_selectors(1)[0]
+    assert (op, selector, stats.count) == ('inner_text', 'xpath=//h2[@class="home-title"]', 1)
+    assert len(profiler.slow_operations) == 1
+    # 调用位置应该指向测试代码本身, 而不是profiler或contextlib
+    assert profiler.slow_operations[0].call_site.startswith('test_profiler.py:')
+    assert profiler.slowest_pages()[0][1].count == 4
+    assert 'home-title' in profiler.report()
+
+def test_trace_is_sampled(tmp_path: Path):
+    calls = []
+    tracing = SimpleNamespace(
+        start=lambda **kwargs: calls.append('start'),
+        stop=lambda path: calls.append(path),
+    )
+    context = SimpleNamespace(tracing=tracing)
+    with OperationProfiler(sample_rate=0).trace(context, 'https://thehackernews.com/') as path:
+        assert path is None
+    assert calls == []
+
+    profiler = OperationProfiler(sample_rate=1, trace_dir=tmp_path)
+    with profiler.trace(context, 'https://thehackernews.com/2025/01/a.html') as path:
+        assert path.parent == tmp_path
+    assert calls == ['start', path]
+    assert profiler.traces == [path]
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        OperationProfiler(sample_rate=1.5)
+
+def test_memory_is_bounded(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(profiler_module, 'max_tracked', 10)
+    profiler = OperationProfiler(threshold_ms=1000, sample_rate=0)
+    for i in range(100):
+        with profiler.measure('goto', f'https://thehackernews.com/{i}.html', f'https://thehackernews.com/{i}.html'):
+            pass
+    assert len(profiler._selectors) <= 20
+    assert len(profiler._pages) <= 20
+
+    stats = profiler_module._Stats()
+    for i in range(10000):
+        stats.add(float(i % 100))
+    assert stats.count == 10000 and stats.max_ms == 99
+    assert len(stats.samples) == profiler_module.reservoir_size
+    assert 85 <= stats.p95_ms <= 99
+
+def test_slow_count_survives_pruning(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(profiler_module, 'max_slow_records', 5)
+    profiler = OperationProfiler(threshold_ms=0, sample_rate=0)
+    for i in range(30):
+        with profiler.measure('click', f'text=Next Page {i}'):
+            pass
+    assert len(profiler.slow_operations) <= 10
+    assert profiler.slow_count == 30
+    assert '慢操作共30次' in profiler.report()
+
+def test_listing_trace_includes_navigation(tmp_path: Path, stub_page):
+    link = "https://thehackernews.com/search/label/Malware"
+    posts = [{'link': f"{link}/{i}", 'title': str(i), 'date': 'Oct 18, 2026', 'tags': '', 'desc': ''} for i in range(2)]
+    page = stub_page(listings={link: [posts, posts]})
+    crawler = SiteCrawler('hackernews', page=page, profiler=OperationProfiler(sample_rate=1, trace_dir=tmp_path))
+    page.events.clear()
+    for _ in crawler.iter_articles({'Malware': link}, max_pages=5):
+        page.events.append('row')
+    # 每页的trace从跳转/点击下一页开始, 在交出数据行之前结束; 最后一次点击失败时也有trace
+    assert page.events == [
+        'trace-start', 'goto', 'trace-stop', 'row', 'row',
+        'trace-start', 'click', 'trace-stop', 'row', 'row',
+        'trace-start', 'trace-stop',
+    ]
@@ -0,0 +1,112 @@
+import sys
+from datetime import date
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews.rows import ArticleRow, ArticleTable, parse_date, rows_to_dataset
+
+headers = ["分区", "链接", "标题", "日期", "标签", "描述", "页码"]
+post = {
+    'link': "https://thehackernews.com/2026/10/example.html",
+    'title': "Example Title",
+    'date': "Oct 18, 2026",
+    'tags': "Cyber Attack / Malware",
+    'desc': "Example description",
+}
+
+def test_from_post_parses_and_interns():
+    # 用join构造内容相同但对象不同的字符串, 模拟每次evaluate返回的新对象
+    a = ArticleRow.from_post(''.join(['Cyber ', 'Attacks']), post, '2', '%b %d, %Y')
+    b = ArticleRow.from_post(''.join(['Cyber', ' Attacks']), dict(post, tags=''.join(['Cyber Attack', ' / Malware'])), 3)
+    assert a.date == date(2026, 10, 18)
+    assert a.page == 2
+    assert a.category is b.category
+    assert a.tags is b.tags
+    assert b.date is None # 没有给出格式时无法解析, 记为空
+
+def test_parse_date():
+    assert parse_date("2026-10-18") == date(2026, 10, 18)
+    assert parse_date("  ") is None
+    assert parse_date("yesterday", '%b %d, %Y') is None
+
+# 列表页上的日期: 图标字体的字符和日期在同一个span里, innerText会把两者拼在一起
+datetime_html = '''<span class="h-datetime"><i class="icon-font icon-calendar">&#59394;</i>Oct 18, 2026</span>'''
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = ''
+
+    def handle_data(self, data):
+        self.text += data
+
+def test_parse_date_from_listing_markup():
+    parser = _TextParser()
+    parser.feed(datetime_html)
+    assert parser.text == "\ue802Oct 18, 2026"
+    assert parse_date(parser.text, '%b %d, %Y') == date(2026, 10, 18)
+    assert parse_date("Published 2026-10-18 by THN") == date(2026, 10, 18)
+
+def test_parse_date_failure_is_logged():
+    messages = []
+    handler = logger.add(messages.append, level='WARNING')
+    try:
+        assert parse_date("October 18, 2026", '%b %d, %Y') is None
+    finally:
+        logger.remove(handler)
+    assert len(messages) == 1 and "October 18, 2026" in messages[0]
+
+def test_row_behaves_like_list():
+    row = ArticleRow.from_post('Cyber Attacks', post, 1, '%b %d, %Y')
+    assert len(row) == 7
+    assert row[1] == post['link']
+    assert row[-1] == 1
+    assert row[:2] == ['Cyber Attacks', post['link']]
+    assert row.to_list() == list(row)
+
+def test_rows_to_dataset_exports():
+    rows = [ArticleRow.from_post('Cyber Attacks', post, 1, '%b %d, %Y')] * 2
+    dataset = rows_to_dataset(rows, headers)
+    dataset.remove_duplicates()
+    assert len(dataset) == 1
+    assert dataset['链接'] == [post['link']]
+    assert '2026-10-18' in dataset.export('csv')
+    assert dataset.export('xlsx')[:2] == b'PK'
+
+def test_date_column_has_one_type():
+    rows = [
+        ArticleRow.from_post('Cyber Attacks', post, 1, '%b %d, %Y'),
+        ArticleRow.from_post('Cyber Attacks', dict(post, date="yesterday"), 1, '%b %d, %Y'),
+        ArticleRow.from_post('Cyber Attacks', dict(post, date=""), 1, '%b %d, %Y'),
+    ]
+    assert rows[0].date == date(2026, 10, 18) and rows[1].date is None
+    # 表格里的日期列都是ISO字符串, 按日期排序不会因为类型不同报错
+    for dataset in (rows_to_dataset(rows, headers), ArticleTable(headers, rows).to_dataset()):
+        assert dataset['日期'] == ['2026-10-18', '', '']
+        assert dataset.sort('日期')['日期'] == ['', '', '2026-10-18']
+
+def test_article_table_is_columnar():
+    table = ArticleTable(headers)
+    a = ArticleRow.from_post(''.join(['Cyber ', 'Attacks']), post, 1, '%b %d, %Y')
+    b = ArticleRow.from_post('Malware', dict(post, link=post['link'] + "?b", date=""), 2, '%b %d, %Y')
+    for row in (a, b, a):
+        table.append(row)
+    table.append(['Malware', post['link'] + "?c", 't', '2026-10-19', 'Ransomware', '', '3'])
+    table.remove_duplicates()
+    assert len(table) == 3
+    assert table['分区'] == ['Cyber Attacks', 'Malware', 'Malware']
+    assert table['分区'][0] is a.category # intern过的字符串在列里共享
+    assert table['页码'] == [1, 2, 3]
+    assert table[0] == a and table[-1].date == date(2026, 10, 19)
+    assert table[1].date is None
+    # 迭代得到的行和原来一样可以按下标访问
+    assert [row[1] for row in table] == [post['link'], post['link'] + "?b", post['link'] + "?c"]
+    dataset = table.to_dataset()
+    assert dataset.headers == headers and dataset[0] == tuple(a)
+    assert table.export('csv') == dataset.export('csv')
+    with pytest.raises(ValueError):
+        ArticleTable(headers[:3])
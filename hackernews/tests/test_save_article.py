@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import pytest
+import tablib
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews.archive import ArticleArchive
+from hackernews.dedup import NearDuplicateIndex
+from hackernews.engine import SiteCrawler, article_headers
+from hackernews.rows import ArticleTable
+
+def make_crawler(page, rows: list[list], table_type=ArticleTable, **kwargs) -> SiteCrawler:
+    table = table_type(headers=article_headers)
+    for row in rows:
+        table.append(row)
+    return SiteCrawler('hackernews', page=page, table=table, **kwargs)
+
+def row(category: str, url: str, title: str, desc: str = '') -> list:
+    return [category, url, title, '2026-10-18', '', desc, 1]
+
+# 默认的按列表格和用户传入的tablib表格都要支持
+@pytest.mark.parametrize('table_type', [ArticleTable, tablib.Dataset])
+def test_archive_skips_saved_urls_and_adds_paths(tmp_path: Path, stub_page, table_type):
+    url = "https://thehackernews.com/2026/10/a.html"
+    page = stub_page({url: "正文"})
+    crawler = make_crawler(page, [
+        row('Cyber Attacks', url, 'A / B?'),
+        row('Vulnerabilities', url, 'A / B?'),
+    ], table_type)
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        crawler.save_article('pdf', archive=archive)
+        # 同一篇文章只打开和渲染一次, 第二个分区只补充路径
+        assert page.visited.count(url) == 1
+        assert archive.paths() == ['Cyber-Attacks/A--B.pdf', 'Vulnerabilities/A--B.pdf']
+        assert archive.read_path('Vulnerabilities/A--B.pdf') == "%PDF 正文".encode('utf-8')
+        assert archive.stats()['blobs'] == 1
+
+        # 再次保存时已归档的URL不会再打开页面
+        crawler.save_article('pdf', archive=archive)
+        assert page.visited.count(url) == 1
+
+body = ("Researchers disclosed a critical remote code execution flaw in a popular VPN appliance "
+        "that attackers are actively exploiting to deploy ransomware on corporate networks")
+
+def test_body_duplicates_are_aliased_and_not_indexed(tmp_path: Path, stub_page):
+    a, b, c = (f"https://thehackernews.com/2026/10/{name}.html" for name in 'abc')
+    page = stub_page({a: body, b: body + " today", c: "An unrelated story about a phishing kit"})
+    dedup, body_dedup = NearDuplicateIndex(), NearDuplicateIndex()
+    crawler = make_crawler(page, [
+        row('Cyber Attacks', a, 'VPN flaw exploited', 'ransomware'),
+        row('Vulnerabilities', b, 'Patch now: appliance bug', 'update'),
+        row('Malware', c, 'Phishing kit', 'credentials'),
+    ], dedup=dedup)
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        crawler.save_article('pdf', archive=archive, body_dedup=body_dedup)
+        assert crawler.near_duplicates == {('Vulnerabilities', b): a}
+        # 被跳过的文章不能进入任何索引, 但归档里能按它的路径读到原文
+        assert b not in dedup and b not in body_dedup
+        assert a in dedup and a in body_dedup and c in body_dedup
+        assert not archive.has(b, 'pdf')
+        assert archive.read_path('Vulnerabilities/Patch-now-appliance-bug.pdf') == archive.get(a, 'pdf')
+
+def test_failed_render_is_not_indexed(tmp_path: Path, stub_page):
+    a, b = (f"https://thehackernews.com/2026/10/{name}.html" for name in 'ab')
+    # a渲染失败, 它的正文不能把之后正文相同的b挡掉
+    page = stub_page({a: body, b: body}, broken={a})
+    body_dedup = NearDuplicateIndex()
+    crawler = make_crawler(page, [
+        row('Cyber Attacks', a, 'VPN flaw exploited'),
+        row('Vulnerabilities', b, 'Patch now: appliance bug'),
+    ])
+    with ArticleArchive(tmp_path, codec='zlib') as archive:
+        crawler.save_article('pdf', archive=archive, body_dedup=body_dedup)
+        assert not archive.has(a, 'pdf') and archive.has(b, 'pdf')
+        assert a not in body_dedup and b in body_dedup
+        assert crawler.near_duplicates == {}
@@ -0,0 +1,126 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+import yaml
+from playwright.sync_api import Page
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews.rows import parse_date
+from hackernews.spec import compile_extractor, load_spec, parse_spec, row_fields
+
+minimal = {
+    'name': 'example',
+    'target': 'https://news.example.com',
+    'categories': {'menu': 'nav ul'},
+    'listing': {'item': 'article'},
+    'pagination': {'next_text': 'Older', 'prev_text': 'Newer'},
+    'fields': {name: f".{name}" for name in row_fields},
+}
+
+def test_load_builtin_spec():
+    spec = load_spec('hackernews')
+    assert spec.target == "https://thehackernews.com"
+    assert spec.next_text == "Next Page"
+    assert tuple(name for name, _ in spec.fields) == ('link', 'title', 'date', 'tags', 'desc')
+    assert load_spec('hackernews') is spec # 同一个描述只解析一次
+
+def test_compile_extractor_is_cached():
+    spec = load_spec('hackernews')
+    extractor = compile_extractor(spec)
+    assert extractor is compile_extractor(spec)
+    assert extractor.startswith("(elements) => elements.map(")
+    for name in row_fields:
+        assert f'"{name}":' in extractor
+    assert '.slice(0, 50)' in extractor
+
+def test_custom_spec_file(tmp_path: Path):
+    data = {
+        'name': 'example',
+        'target': 'https://news.example.com',
+        'categories': {'menu': 'nav ul'},
+        'listing': {'item': 'article'},
+        'pagination': {'next_text': 'Older', 'prev_text': 'Newer'},
+        # 字段可以直接简写成选择器
+        'fields': {name: f".{name}" for name in row_fields},
+    }
+    path = tmp_path / 'example.yaml'
+    path.write_text(yaml.safe_dump(data), encoding='utf-8')
+    spec = load_spec(path)
+    assert spec.name == 'example'
+    assert dict(spec.fields)['title'].selector == '.title'
+    assert spec.article_body is None
+
+def test_missing_field():
+    with pytest.raises(ValueError, match='link'):
+        parse_spec({
+            'name': 'broken',
+            'target': 'https://news.example.com',
+            'categories': {'menu': 'nav ul'},
+            'listing': {'item': 'article'},
+            'pagination': {'next_text': 'Older', 'prev_text': 'Newer'},
+            'fields': {'title': 'h2'},
+        })
+
+def test_empty_or_null_sections(tmp_path: Path):
+    # article: 后面什么都不写时等同于不写
+    assert parse_spec({**minimal, 'article': None}).article_body is None
+    path = tmp_path / 'empty.yaml'
+    path.write_text('', encoding='utf-8')
+    with pytest.raises(ValueError, match='映射'):
+        load_spec(path)
+    with pytest.raises(ValueError, match='categories'):
+        parse_spec({**minimal, 'categories': None})
+    with pytest.raises(ValueError, match='title'):
+        parse_spec({**minimal, 'fields': {**minimal['fields'], 'title': None}})
+
+# 与The Hacker News文章列表结构相同的简化页面, 第二篇文章没有标签
+listing_html = """
+<div class="blog-posts clear">
+  <div class="body-post clear">
+    <a class="story-link" href="https://thehackernews.com/2026/10/vpn-flaw.html">
+      <div class="clear home-post-box cf">
+        <div class="clear home-right">
+          <h2 class="home-title">Critical VPN Flaw Exploited in the Wild</h2>
+          <div class="item-label">
+            <span class="h-datetime"><i class="icon-font icon-calendar">&#59394;</i>Oct 18, 2026</span>
+            <span class="h-tags">Vulnerability / Network Security</span>
+          </div>
+          <div class="home-desc">Researchers disclosed a critical remote code execution flaw in a popular VPN appliance.</div>
+        </div>
+      </div>
+    </a>
+  </div>
+  <div class="body-post clear">
+    <a class="story-link" href="https://thehackernews.com/2026/10/phishing-kit.html">
+      <div class="clear home-post-box cf">
+        <div class="clear home-right">
+          <h2 class="home-title">New Phishing Kit Targets Banks</h2>
+          <div class="item-label">
+            <span class="h-datetime"><i class="icon-font icon-calendar">&#59394;</i>Oct 17, 2026</span>
+          </div>
+          <div class="home-desc">Short.</div>
+        </div>
+      </div>
+    </a>
+  </div>
+</div>
+"""
+
+def test_extractor_runs_on_listing_markup(page: Page):
+    spec = load_spec('hackernews')
+    page.set_content(listing_html)
+    posts = page.locator(spec.item).evaluate_all(compile_extractor(spec))
+    assert [post['link'] for post in posts] == [
+        "https://thehackernews.com/2026/10/vpn-flaw.html",
+        "https://thehackernews.com/2026/10/phishing-kit.html",
+    ]
+    assert posts[0]['title'] == "Critical VPN Flaw Exploited in the Wild"
+    assert posts[0]['date'].endswith("Oct 18, 2026")
+    assert parse_date(posts[0]['date'], dict(spec.fields)['date'].format) == date(2026, 10, 18)
+    assert posts[0]['tags'] == "Vulnerability / Network Security"
+    assert posts[0]['desc'] == "Researchers disclosed a critical remote code execution flaw in a popular VPN appliance."[:50]
+    # 缺少标签时使用描述文件里的默认值
+    assert posts[1]['tags'] == dict(spec.fields)['tags'].default
+    assert posts[1]['desc'] == "Short."
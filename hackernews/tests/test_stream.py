@@ -0,0 +1,168 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).parents[2]))
+from hackernews import engine
+from hackernews.engine import SiteCrawler, _iterate_in_thread, stream_articles
+from hackernews.rows import ArticleRow
+
+def _run_in_thread(coro):
+    # pytest-playwright的playwright夹具会在主线程启动sync_playwright, 之后主线程里的
+    # asyncio.run都会失败; 每个协程放到独立线程的新事件循环里运行, 与夹具互不影响
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+def _rows(count: int, produced: list, closed: threading.Event):
+    try:
+        for i in range(count):
+            produced.append(i)
+            yield ArticleRow('Cyber Attacks', f"https://thehackernews.com/{i}.html", f"title {i}", None, '', '', 1)
+    finally:
+        closed.set()
+
+def test_rows_arrive_in_order():
+    async def consume():
+        produced, closed = [], threading.Event()
+        rows = [row async for row in _iterate_in_thread(lambda: _rows(10, produced, closed), buffer=2)]
+        return rows, closed.is_set()
+    rows, closed = _run_in_thread(consume())
+    assert [row.link for row in rows] == [f"https://thehackernews.com/{i}.html" for i in range(10)]
+    assert rows[0].to_list()[0] == 'Cyber Attacks'
+    assert closed
+
+def test_backpressure_and_early_stop():
+    async def consume():
+        produced, closed = [], threading.Event()
+        async with aclosing(_iterate_in_thread(lambda: _rows(1000, produced, closed), buffer=4)) as stream:
+            async for row in stream:
+                await asyncio.sleep(0.05) # 给生产线程足够的时间, 它应该被缓冲区挡住
+                break
+        return len(produced), closed.is_set()
+    produced, closed = _run_in_thread(consume())
+    # 缓冲4行, 加上正在put和已取走的各一行
+    assert produced <= 4 + 2
+    assert closed
+
+def test_errors_are_raised_in_consumer():
+    def broken():
+        yield ArticleRow('Cyber Attacks', 'https://thehackernews.com/a.html', 'a', None, '', '', 1)
+        raise RuntimeError("页面加载失败")
+
+    async def consume():
+        return [row async for row in _iterate_in_thread(broken)]
+    with pytest.raises(RuntimeError, match="页面加载失败"):
+        _run_in_thread(consume())
+
+attacks = "https://thehackernews.com/search/label/Cyber%20Attack"
+malware = "https://thehackernews.com/search/label/Malware"
+
+def _listing(link: str, pages: int) -> list[list[dict]]:
+    return [
+        [{'link': f"{link}/{page}-{i}", 'title': f"title {page}-{i}", 'date': "\ue802Oct 18, 2026",
+          'tags': 'Malware', 'desc': ''} for i in range(2)]
+        for page in range(1, pages + 1)
+    ]
+
+def _listing_page(stub_page):
+    return stub_page(
+        menu={'Cyber Attacks': attacks, 'Malware': malware, 'Contact': '/p/contact.html'},
+        listings={attacks: _listing(attacks, 3), malware: _listing(malware, 1)},
+    )
+
+def test_iter_articles_stops_at_max_pages_and_last_page(stub_page):
+    page = _listing_page(stub_page)
+    crawler = SiteCrawler('hackernews', page=page)
+    rows = list(crawler.iter_articles(['Cyber Attacks', 'Malware'], max_pages=2))
+    # Cyber Attacks只取前两页, Malware只有一页, 不会再点下一页
+    assert [(row.category, row.page) for row in rows] == [
+        ('Cyber Attacks', 1), ('Cyber Attacks', 1), ('Cyber Attacks', 2), ('Cyber Attacks', 2),
+        ('Malware', 1), ('Malware', 1),
+    ]
+    assert page.clicks == 1 and crawler._is_last_page
+
+    rows = list(crawler.iter_articles({'Cyber Attacks': attacks}, max_pages=10))
+    assert [row.page for row in rows] == [1, 1, 2, 2, 3, 3]
+    assert crawler._is_last_page
+    with pytest.raises(ValueError, match='Contact'):
+        crawler.iter_articles(['Contact'])
+
+def test_iter_articles_max_pages(stub_page):
+    page = _listing_page(stub_page)
+    crawler = SiteCrawler('hackernews', page=page)
+    # None表示一直翻到最后一页
+    rows = list(crawler.iter_articles({'Cyber Attacks': attacks}, max_pages=None))
+    assert [row.page for row in rows] == [1, 1, 2, 2, 3, 3]
+    visited = len(page.visited)
+    for max_pages in (0, -1):
+        with pytest.raises(ValueError, match='max_pages'):
+            crawler.iter_articles({'Cyber Attacks': attacks}, max_pages=max_pages)
+    assert len(page.visited) == visited # 参数不合法时不会打开任何页面
+
+def _fake_playwright(monkeypatch: pytest.MonkeyPatch, page):
+    # 记录launch和new_context收到的参数, 浏览器关闭时设置closed
+    browser = SimpleNamespace(closed=threading.Event(), launch_options=None, context_options=None)
+    browser.close = browser.closed.set
+
+    def new_context(**options):
+        browser.context_options = options
+        return SimpleNamespace(new_page=lambda: page)
+    browser.new_context = new_context
+
+    def launch(**options):
+        browser.launch_options = options
+        return browser
+    playwright = SimpleNamespace(chromium=SimpleNamespace(launch=launch))
+
+    @contextmanager
+    def fake_sync_playwright():
+        yield playwright
+    monkeypatch.setattr(engine, 'sync_playwright', fake_sync_playwright)
+    return playwright, browser
+
+def test_stream_articles_closes_browser_on_early_stop(stub_page, monkeypatch: pytest.MonkeyPatch):
+    page = _listing_page(stub_page)
+    _, browser = _fake_playwright(monkeypatch, page)
+
+    async def consume():
+        stream = stream_articles('hackernews', ['Cyber Attacks'], max_pages=3, buffer=1,
+                                 launch_options={'proxy': {'server': 'http://proxy:8080'}},
+                                 context_options={'user_agent': 'crawler'})
+        first = await anext(stream)
+        await stream.aclose()
+        # aclose返回时后台线程已经退出, 浏览器已经关闭
+        return first, browser.closed.is_set()
+    first, closed = _run_in_thread(consume())
+    assert (first.category, first.page) == ('Cyber Attacks', 1)
+    assert closed
+    assert browser.launch_options == {'headless': True, 'proxy': {'server': 'http://proxy:8080'}}
+    assert browser.context_options == {'user_agent': 'crawler'}
+
+def test_stream_articles_with_crawler_factory(stub_page, monkeypatch: pytest.MonkeyPatch):
+    page = _listing_page(stub_page)
+    playwright, _ = _fake_playwright(monkeypatch, page)
+    received = []
+
+    def factory(p):
+        # 工厂在后台线程里拿到Playwright实例, 自己决定怎样创建页面和爬虫
+        received.append(p)
+        return SiteCrawler('hackernews', page=page)
+
+    async def consume():
+        return [row async for row in stream_articles(
+            categories={'Cyber Attacks': attacks}, max_pages=None, crawler_factory=factory,
+        )]
+    rows = _run_in_thread(consume())
+    assert received == [playwright]
+    assert [row.page for row in rows] == [1, 1, 2, 2, 3, 3]
+
+    async def invalid():
+        return [row async for row in stream_articles('hackernews', max_pages=0)]
+    with pytest.raises(ValueError, match='max_pages'):
+        _run_in_thread(invalid())